@@ -1,5 +1,9 @@
 import requests
 
+# Reused for every request so repeated posts share one keep-alive connection
+SESSION = requests.Session()
+SESSION.headers.update({"X-API-Key": "OMHT2409"})
+
 expense = {
     "amount": 500.0,
     "description": "PS5", 
@@ -8,11 +12,7 @@ expense = {
     "type": "expense"
 }
 
-headers = {
-    "X-API-Key": "OMHT2409"
-}
-
-response = requests.post("http://127.0.0.1:5000/api/expenses", json=expense, headers=headers)
+response = SESSION.post("http://127.0.0.1:5000/api/expenses", json=expense)
 
 if response.status_code == 201:
     print("Expense added!")
@@ -0,0 +1,8 @@
+import random
+
+# Kept apart from init_db.py so importing it never pulls in psycopg: the
+# gunicorn master must not load psycopg before gevent patches the workers
+
+def backoff_delay(attempt, max_delay):
+    """Exponential backoff with jitter, so restarting containers don't retry in lockstep"""
+    return min(max_delay, (2 ** attempt) * 0.5 + random.uniform(0, 0.5))
@@ -0,0 +1,38 @@
+import multiprocessing
+import os
+import subprocess
+import sys
+
+bind = '0.0.0.0:5000'
+
+INIT_DB_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'init_db.py')
+
+# Requests spend nearly all their time waiting on Postgres, so each gevent
+# worker serves many of them concurrently on greenlets. psycopg 3 detects
+# gevent's monkey-patching and yields the greenlet while waiting on the
+# database, provided it is first imported in the patched worker (see
+# on_starting).
+#
+# Every worker has its own connection pool. DB_MAX_CONNECTIONS is the budget
+# shared by all of them, kept below Postgres' default max_connections (100)
+# with room for init_db.py and admin sessions. Unless DB_POOL_MAX is set,
+# each worker's pool gets an equal share; workers inherit it from the master.
+DB_MAX_CONNECTIONS = int(os.getenv('DB_MAX_CONNECTIONS', '90'))
+workers = int(os.getenv('GUNICORN_WORKERS', min(multiprocessing.cpu_count() * 2 + 1, DB_MAX_CONNECTIONS)))
+os.environ.setdefault('DB_POOL_MAX', str(max(1, DB_MAX_CONNECTIONS // workers)))
+worker_class = 'gevent'
+worker_connections = 1000
+
+# Reload on code changes during development, as the Flask debug server did
+reload = os.getenv('FLASK_DEBUG', '0') == '1'
+
+def on_starting(server):
+    """Create the table and indexes once, before any worker starts
+
+    init_db.py runs in its own process: psycopg picks a blocking wait
+    function if it is imported before gevent patches the workers, and
+    forked workers would inherit that choice from the master.
+    """
+    result = subprocess.run([sys.executable, INIT_DB_SCRIPT])
+    if result.returncode != 0:
+        raise SystemExit(result.returncode)
@@ -0,0 +1,107 @@
+import psycopg
+import os
+import sys
+import time
+from backoff import backoff_delay
+
+# Built with CONCURRENTLY so creating or replacing an index never blocks
+# writes to a live expenses table. Composite indexes serve type/category
+# filters combined with date ranges, and the per-year monthly summary.
+INDEX_STATEMENTS = (
+    'CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_expenses_date ON expenses(date)',
+    'CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_expenses_type_date ON expenses(type, date DESC)',
+    'CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_expenses_category_date ON expenses(category, date DESC)',
+    '''CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_expenses_year_month
+        ON expenses ((EXTRACT(YEAR FROM date)), (EXTRACT(MONTH FROM date)), type)''',
+    # Covered by the leading column of the composite indexes
+    'DROP INDEX CONCURRENTLY IF EXISTS idx_expenses_type',
+    'DROP INDEX CONCURRENTLY IF EXISTS idx_expenses_category',
+)
+
+# === ESPERAR A LA BASE DE DATOS Y CREAR LA TABLA ===
+def wait_for_db_and_create_table():
+    """Wait for database to be ready and create table and indexes if needed
+
+    Runs once per deployment as ``python init_db.py`` (gunicorn's
+    on_starting hook starts it in a subprocess), not in every worker.
+    """
+    max_retries = 20
+    max_retry_delay = 30
+
+    print("🚀 Starting database initialization...")
+
+    for attempt in range(max_retries):
+        connection = None
+        try:
+            print(f"📡 Attempting database connection ({attempt + 1}/{max_retries})...")
+            # CONCURRENTLY cannot run inside a transaction block
+            connection = psycopg.connect(
+                host=os.getenv('DB_HOST', 'localhost'),
+                port=os.getenv('DB_PORT', '5432'),
+                dbname=os.getenv('DB_NAME', 'expensesdb'),
+                user=os.getenv('DB_USER', 'postgres'),
+                password=os.getenv('DB_PASSWORD', 'postgres'),
+                autocommit=True
+            )
+            cursor = connection.cursor()
+
+            # One idempotent batch for everything that can share a round-trip:
+            # the table, cleanup of the dropped summary version trigger (its
+            # shared row serialized every write), and the list of INVALID
+            # indexes an interrupted concurrent build leaves behind, which
+            # IF NOT EXISTS would skip, so they are dropped and built again
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS expenses (
+                    id SERIAL PRIMARY KEY,
+                    amount DECIMAL(10,2) NOT NULL,
+                    description VARCHAR(255) NOT NULL,
+                    category VARCHAR(50) NOT NULL,
+                    date DATE NOT NULL,
+                    type VARCHAR(10) CHECK (type IN ('expense', 'income')) NOT NULL,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                );
+                
+                DROP TRIGGER IF EXISTS expenses_version_bump ON expenses;
+                DROP FUNCTION IF EXISTS bump_expenses_version();
+                DROP TABLE IF EXISTS expenses_version;
+                
+                SELECT indexrelid::regclass::text FROM pg_index
+                WHERE indrelid = 'expenses'::regclass AND NOT indisvalid;
+            ''')
+            # Only the last statement's result (the SELECT) has rows
+            while cursor.nextset():
+                pass
+            for (index_name,) in cursor.fetchall():
+                print(f"🔧 Rebuilding invalid index {index_name}")
+                cursor.execute(f'DROP INDEX CONCURRENTLY IF EXISTS {index_name}')
+
+            # CONCURRENTLY refuses to run inside a multi-statement batch,
+            # so each index statement needs its own round-trip
+            for statement in INDEX_STATEMENTS:
+                cursor.execute(statement)
+
+            print("✅ Database is ready and table is accessible!")
+            return True
+
+        except psycopg.OperationalError as e:
+            print(f"⏳ Database not ready yet: {e}")
+            if attempt < max_retries - 1:
+                retry_delay = backoff_delay(attempt, max_retry_delay)
+                print(f"🕒 Waiting {retry_delay:.1f} seconds before retry...")
+                time.sleep(retry_delay)
+        except Exception as e:
+            print(f"⚠️ Database error: {e}")
+            if attempt < max_retries - 1:
+                time.sleep(backoff_delay(attempt, max_retry_delay))
+        finally:
+            if connection:
+                cursor.close()
+                connection.close()
+
+    print("❌ FATAL: Failed to initialize database after multiple attempts")
+    return False
+
+if __name__ == '__main__':
+    if not wait_for_db_and_create_table():
+        print("❌ Exiting: Database initialization failed")
+        sys.exit(1)
@@ -1,117 +1,132 @@
-from flask import Flask, request, jsonify
-from datetime import datetime
-import psycopg2
-from psycopg2.extras import RealDictCursor
+from flask import Flask, Response, request, jsonify
+from flask.json.provider import JSONProvider
+from datetime import date, datetime
+import orjson
+import psycopg
+from psycopg.rows import dict_row
+from psycopg.types.numeric import FloatLoader
+from psycopg_pool import ConnectionPool, PoolTimeout
+from cachetools import TTLCache
 import os
-import json
-from pydantic import BaseModel, ValidationError, validator
-from typing import Literal
+from pydantic import BaseModel, Field, TypeAdapter, ValidationError, field_validator
+from typing import Annotated, List, Literal
 from decimal import Decimal
 from functools import wraps
+from contextlib import contextmanager
+import atexit
+import hmac
+import queue
+import select
+import threading
 import time
-import sys
 
-# === NUEVA FUNCIÓN PARA ESPERAR Y CREAR LA TABLA ===
-def wait_for_db_and_create_table():
-    """Wait for database to be ready and create table if needed"""
-    max_retries = 20
-    retry_delay = 3
-    
-    print("🚀 Starting database initialization...")
-    
-    for attempt in range(max_retries):
-        connection = None
-        try:
-            print(f"📡 Attempting database connection ({attempt + 1}/{max_retries})...")
-            connection = psycopg2.connect(
-                host=os.getenv('DB_HOST', 'localhost'),
-                port=os.getenv('DB_PORT', '5432'),
-                database=os.getenv('DB_NAME', 'expensesdb'),
-                user=os.getenv('DB_USER', 'postgres'),
-                password=os.getenv('DB_PASSWORD', 'postgres')
-            )
-            cursor = connection.cursor()
-            
-            # Check if table exists
-            cursor.execute("""
-                SELECT EXISTS (
-                    SELECT FROM information_schema.tables 
-                    WHERE table_schema = 'public' 
-                    AND table_name = 'expenses'
-                );
-            """)
-            table_exists = cursor.fetchone()[0]
-            
-            if not table_exists:
-                print("🔄 Creating 'expenses' table...")
-                cursor.execute('''
-                    CREATE TABLE expenses (
-                        id SERIAL PRIMARY KEY,
-                        amount DECIMAL(10,2) NOT NULL,
-                        description VARCHAR(255) NOT NULL,
-                        category VARCHAR(50) NOT NULL,
-                        date DATE NOT NULL,
-                        type VARCHAR(10) CHECK (type IN ('expense', 'income')) NOT NULL,
-                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                    )
-                ''')
-                
-                cursor.execute('CREATE INDEX idx_expenses_date ON expenses(date)')
-                cursor.execute('CREATE INDEX idx_expenses_category ON expenses(category)')
-                cursor.execute('CREATE INDEX idx_expenses_type ON expenses(type)')
-                
-                connection.commit()
-                print("✅ 'expenses' table created successfully!")
-            else:
-                print("✅ 'expenses' table already exists")
-            
-            # Verify we can actually query the table
-            cursor.execute("SELECT 1 FROM expenses LIMIT 1")
-            print("✅ Database is ready and table is accessible!")
-            return True
-            
-        except psycopg2.OperationalError as e:
-            print(f"⏳ Database not ready yet: {e}")
-            if attempt < max_retries - 1:
-                print(f"🕒 Waiting {retry_delay} seconds before retry...")
-                time.sleep(retry_delay)
-        except Exception as e:
-            print(f"⚠️ Database error: {e}")
-            if attempt < max_retries - 1:
-                time.sleep(retry_delay)
-        finally:
-            if connection:
-                cursor.close()
-                connection.close()
-    
-    print("❌ FATAL: Failed to initialize database after multiple attempts")
-    return False
-
-# === INICIALIZAR BASE DE DATOS ANTES DE CREAR LA APP FLASK ===
-if not wait_for_db_and_create_table():
-    print("❌ Exiting: Database initialization failed")
-    sys.exit(1)
+# Table and index setup runs once per deployment in init_db.py (started by
+# gunicorn's on_starting hook), not in every worker that imports this module
+from backoff import backoff_delay
 
-# === AHORA CREAMOS LA APP FLASK ===
+# === CREAMOS LA APP FLASK ===
 app = Flask(__name__)
 
 DB_CONFIG = {
     'host': os.getenv('DB_HOST', 'localhost'),
     'port': os.getenv('DB_PORT', '5432'),
-    'database': os.getenv('DB_NAME', 'expensesdb'),
+    'dbname': os.getenv('DB_NAME', 'expensesdb'),
     'user': os.getenv('DB_USER', 'postgres'),
     'password': os.getenv('DB_PASSWORD', 'postgres')
 }
 
-VALID_API_KEYS = ["OMHT2409"]
-CATEGORIES = ['food', 'transport', 'entertainment', 'bills', 'shopping', 'health', 'education', 'income', 'other']
+DB_POOL_MIN = int(os.getenv('DB_POOL_MIN', '1'))
+DB_POOL_MAX = int(os.getenv('DB_POOL_MAX', '16'))
+DB_POOL_TIMEOUT = float(os.getenv('DB_POOL_TIMEOUT', '30'))
 
-# === ELIMINA la función create_table_if_not_exists original ===
-# Ya no la necesitamos porque usamos wait_for_db_and_create_table
+# /api/status reports the database as unreachable after this many seconds
+# rather than waiting the full DB_POOL_TIMEOUT
+DB_STATUS_TIMEOUT = 2
 
-# ... EL RESTO DE TU CÓDIGO PERMANECE EXACTAMENTE IGUAL ...
-# [todo el resto de tu código sin cambios]
+# Queries run this many times on a connection become server-side prepared
+# statements, so Postgres skips parsing and planning them afterwards
+DB_PREPARE_THRESHOLD = 5
 
+# Return NUMERIC columns (amount, sums) as float straight from the driver,
+# instead of converting every row by hand
+psycopg.adapters.register_loader('numeric', FloatLoader)
+
+# Connections are opened once and reused across requests instead of paying
+# the connect + auth round-trip on every call. Requests beyond max_size wait
+# up to DB_POOL_TIMEOUT seconds for a free connection. Each connection is
+# checked before it is handed out, so connections broken by a database
+# restart are replaced instead of failing a request.
+def check_connection_dropped(connection):
+    """Pool check without a round-trip: an idle connection has nothing to
+    read unless the server closed it or sent a termination notice"""
+    readable, _, _ = select.select([connection.fileno()], [], [], 0)
+    if readable:
+        # Closed first, so the pool discards it instead of handing it back
+        connection.close()
+        raise psycopg.OperationalError('Connection closed by the server')
+
+DB_POOL = ConnectionPool(
+    kwargs={**DB_CONFIG, 'prepare_threshold': DB_PREPARE_THRESHOLD},
+    min_size=DB_POOL_MIN,
+    max_size=DB_POOL_MAX,
+    timeout=DB_POOL_TIMEOUT,
+    check=check_connection_dropped,
+    open=True
+)
+atexit.register(DB_POOL.close)
+
+VALID_API_KEYS = frozenset({"OMHT2409"})
+CATEGORIES = ('food', 'transport', 'entertainment', 'bills', 'shopping', 'health', 'education', 'income', 'other')
+_CATEGORY_SET = frozenset(CATEGORIES)
+_CATEGORY_ERR = f'Invalid category. Options: {", ".join(CATEGORIES)}'
+
+MONTH_NAMES = {
+    1: 'January', 2: 'February', 3: 'March', 4: 'April',
+    5: 'May', 6: 'June', 7: 'July', 8: 'August',
+    9: 'September', 10: 'October', 11: 'November', 12: 'December'
+}
+
+# Optional list filters, in the order their parameters are bound
+EXPENSE_FILTERS = (
+    ('start_date', 'date >= %s'),
+    ('end_date', 'date <= %s'),
+    ('category', 'category = %s'),
+    ('type', 'type = %s'),
+)
+
+# filter mask -> SELECT sql. Keeping the text stable per filter combination
+# lets psycopg turn it into a server-side prepared statement.
+_QUERY_CACHE = {}
+
+# Expense lists are read in id-ordered chunks of this many rows, each on a
+# short-lived pooled connection. Once the response has started, a failed
+# chunk is retried this many times, waiting at most EXPENSES_RETRY_MAX_DELAY
+# seconds between attempts
+EXPENSES_CHUNK_SIZE = 1000
+EXPENSES_CHUNK_RETRIES = 2
+EXPENSES_RETRY_MAX_DELAY = 1
+
+# Expenses accepted by /api/expenses/async are written by a background thread
+# in batches of up to WRITE_BATCH_SIZE rows, at least every WRITE_FLUSH_INTERVAL
+# seconds while rows are waiting
+WRITE_QUEUE_SIZE = 10000
+WRITE_BATCH_SIZE = 500
+WRITE_FLUSH_INTERVAL = 0.5
+WRITE_RETRY_MAX_DELAY = 10
+
+# Monthly summaries per year. A worker clears its own copy whenever it writes
+# or deletes expenses; writes handled by other workers show up once the entry
+# expires, so summaries are at most SUMMARY_CACHE_TTL seconds stale.
+SUMMARY_CACHE_TTL = 60
+_SUMMARY_CACHE = TTLCache(maxsize=8, ttl=SUMMARY_CACHE_TTL)
+_SUMMARY_CACHE_LOCK = threading.Lock()
+_summary_cache_generation = 0
+
+def is_valid_api_key(api_key):
+    # compare_digest keeps the check constant-time, so response timing
+    # does not reveal how much of a key matched
+    candidate = api_key.encode()
+    return any(hmac.compare_digest(candidate, key.encode()) for key in VALID_API_KEYS)
 
 def require_api_key(f):
     @wraps(f)
@@ -122,192 +137,313 @@ def require_api_key(f):
         if not api_key:
             return jsonify({'error': 'API Key required'}), 401
         
-        if api_key not in VALID_API_KEYS:
+        if not is_valid_api_key(api_key):
             return jsonify({'error': 'Invalid API Key'}), 401
         
         return f(*args, **kwargs)
     return decorated_function
 
 class ExpenseBase(BaseModel):
-    amount: Decimal
-    description: str
+    # Same bounds as the DECIMAL(10,2) column, checked by pydantic-core
+    # itself: rejects booleans, inf/nan, more than 2 decimal places and
+    # anything the column would overflow on
+    amount: Annotated[Decimal, Field(gt=0, max_digits=10, decimal_places=2)]
+    # VARCHAR(255); Postgres text cannot hold NUL characters
+    description: Annotated[str, Field(max_length=255, pattern=r'^[^\x00]*$')]
     category: str
-    date: str
+    # Parsed once into a datetime.date, which psycopg binds as a DATE
+    date: date
     type: Literal['expense', 'income']
 
-    @validator('amount')
-    def amount_must_be_positive(cls, v):
-        if v <= 0:
-            raise ValueError('Amount must be greater than 0')
-        return v
-
-    @validator('category')
+    @field_validator('category')
+    @classmethod
     def category_must_be_valid(cls, v):
-        if v not in CATEGORIES:
-            raise ValueError(f'Invalid category. Options: {", ".join(CATEGORIES)}')
-        return v
-
-    @validator('date')
-    def date_must_be_valid(cls, v):
-        try:
-            datetime.fromisoformat(v)
-        except ValueError:
-            raise ValueError('Date must be in ISO format (YYYY-MM-DD)')
+        if v not in _CATEGORY_SET:
+            raise ValueError(_CATEGORY_ERR)
         return v
 
 class ExpenseCreate(ExpenseBase):
     pass
 
-class ExpenseResponse(ExpenseBase):
-    id: int
-
-    class Config:
-        json_encoders = {
-            Decimal: lambda v: float(v)
-        }
+EXPENSE_LIST_ADAPTER = TypeAdapter(List[ExpenseCreate])
 
-def get_db_connection():
+@contextmanager
+def db_conn(timeout=None):
     try:
-        connection = psycopg2.connect(**DB_CONFIG)
-        return connection
+        connection = DB_POOL.getconn(timeout=timeout)
     except Exception as ex:
         print(f'Database connection error: {ex}')
-        return None
+        raise Exception("No database connection") from ex
 
-def save_expense(data: ExpenseCreate):
-    connection = get_db_connection()
-    if connection is None:
-        raise Exception("No database connection")
-    
     try:
-        with connection.cursor() as cursor:
-            cursor.execute('''
-                INSERT INTO expenses (amount, description, category, date, type)
-                VALUES (%s, %s, %s, %s, %s)
-                RETURNING id, amount, description, category, date, type
-            ''', (
-                float(data.amount),
-                data.description,
-                data.category,
-                data.date,
-                data.type
-            ))
-            expense = cursor.fetchone()
-            connection.commit()
-            
-            return ExpenseResponse(
-                id=expense[0],
-                amount=Decimal(str(expense[1])),
-                description=expense[2],
-                category=expense[3],
-                date=expense[4].isoformat(),
-                type=expense[5]
-            )
-    except Exception as e:
-        connection.rollback()
-        raise Exception(f"Error saving record: {str(e)}")
+        # Ends the transaction (commit, or rollback on error); a pooled
+        # connection is not closed on exit
+        with connection:
+            yield connection
     finally:
-        connection.close()
+        DB_POOL.putconn(connection)
 
-def get_expenses_from_db(filters=None):
-    connection = get_db_connection()
-    if connection is None:
-        raise Exception("No database connection")
+def invalidate_summary_cache():
+    global _summary_cache_generation
+    with _SUMMARY_CACHE_LOCK:
+        _summary_cache_generation += 1
+        _SUMMARY_CACHE.clear()
+
+def save_expense(data: ExpenseCreate):
+    with db_conn() as connection:
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute('''
+                    INSERT INTO expenses (amount, description, category, date, type)
+                    VALUES (%s, %s, %s, %s, %s)
+                    RETURNING id, amount, description, category, date, type
+                ''', (
+                    data.amount,
+                    data.description,
+                    data.category,
+                    data.date,
+                    data.type
+                ))
+                expense = cursor.fetchone()
+                connection.commit()
+                invalidate_summary_cache()
+                
+                # Rows coming back from the database are trusted, so they
+                # are returned as-is instead of going through the validators
+                return {
+                    'id': expense[0],
+                    'amount': expense[1],
+                    'description': expense[2],
+                    'category': expense[3],
+                    'date': expense[4],
+                    'type': expense[5]
+                }
+        except Exception as e:
+            connection.rollback()
+            raise Exception(f"Error saving record: {str(e)}") from e
+
+def save_expenses_bulk(datas: List[ExpenseCreate]):
+    rows = [
+        (d.amount, d.description, d.category, d.date, d.type)
+        for d in datas
+    ]
+    if not rows:
+        return []
     
-    try:
-        with connection.cursor(cursor_factory=RealDictCursor) as cursor:
-            query = 'SELECT * FROM expenses WHERE 1=1'
-            params = []
-            
-            if filters:
-                if filters.get('start_date'):
-                    query += ' AND date >= %s'
-                    params.append(filters['start_date'])
-                if filters.get('end_date'):
-                    query += ' AND date <= %s'
-                    params.append(filters['end_date'])
-                if filters.get('category'):
-                    query += ' AND category = %s'
-                    params.append(filters['category'])
-                if filters.get('type'):
-                    query += ' AND type = %s'
-                    params.append(filters['type'])
-            
-            query += ' ORDER BY date DESC, id DESC'
-            cursor.execute(query, params)
-            expenses = cursor.fetchall()
-            
-            for expense in expenses:
-                expense['amount'] = Decimal(str(expense['amount']))
-                expense['date'] = expense['date'].isoformat()
-                expense['id'] = int(expense['id'])
+    with db_conn() as connection:
+        try:
+            with connection.cursor() as cursor:
+                # executemany sends every INSERT in pipeline mode, so the whole
+                # batch costs one network round-trip and a single commit
+                cursor.executemany('''
+                    INSERT INTO expenses (amount, description, category, date, type)
+                    VALUES (%s, %s, %s, %s, %s)
+                    RETURNING id
+                ''', rows, returning=True)
                 
-            return expenses
-    except Exception as e:
-        raise Exception(f"Error getting records: {str(e)}")
-    finally:
-        connection.close()
+                ids = []
+                while True:
+                    ids.append(cursor.fetchone()[0])
+                    if not cursor.nextset():
+                        break
+                connection.commit()
+                invalidate_summary_cache()
+                
+                return ids
+        except Exception as e:
+            connection.rollback()
+            raise Exception(f"Error saving records: {str(e)}") from e
 
-def get_monthly_summaries_from_db(year):
-    connection = get_db_connection()
-    if connection is None:
-        raise Exception("No database connection")
+def get_expenses_query(filters):
+    """Return the (cached) chunk query and filter parameters for the list filters"""
+    mask = 0
+    params = []
+    for bit, (field, _) in enumerate(EXPENSE_FILTERS):
+        value = filters.get(field) if filters else None
+        if value:
+            mask |= 1 << bit
+            params.append(value)
     
-    try:
-        with connection.cursor() as cursor:
-            cursor.execute('''
-                SELECT 
-                    EXTRACT(MONTH FROM date) as month,
-                    category,
-                    SUM(amount) as total
-                FROM expenses 
-                WHERE type = 'income' AND EXTRACT(YEAR FROM date) = %s
-                GROUP BY EXTRACT(MONTH FROM date), category
-                ORDER BY month
-            ''', (year,))
-            income_results = cursor.fetchall()
-            
-            cursor.execute('''
-                SELECT 
-                    EXTRACT(MONTH FROM date) as month,
-                    category,
-                    SUM(amount) as total
-                FROM expenses 
-                WHERE type = 'expense' AND EXTRACT(YEAR FROM date) = %s
-                GROUP BY EXTRACT(MONTH FROM date), category
-                ORDER BY month
-            ''', (year,))
-            expense_results = cursor.fetchall()
-            
-            return income_results, expense_results
-    except Exception as e:
-        raise Exception(f"Error getting summaries: {str(e)}")
-    finally:
-        connection.close()
+    query = _QUERY_CACHE.get(mask)
+    
+    if query is None:
+        conditions = [
+            condition for bit, (_, condition) in enumerate(EXPENSE_FILTERS)
+            if mask & (1 << bit)
+        ]
+        # Keyset pagination: each chunk resumes after the last id sent
+        conditions.append('id > %s')
+        
+        query = 'SELECT * FROM expenses WHERE ' + ' AND '.join(conditions)
+        query += ' ORDER BY id ASC LIMIT %s'
+        
+        _QUERY_CACHE[mask] = query
+    
+    return query, params
+
+def get_expenses_chunk(query, params, after_id):
+    with db_conn() as connection:
+        try:
+            with connection.cursor(row_factory=dict_row) as cursor:
+                cursor.execute(query, (*params, after_id, EXPENSES_CHUNK_SIZE))
+                return cursor.fetchall()
+        except Exception as e:
+            raise Exception(f"Error getting records: {str(e)}") from e
+
+def iter_expense_chunks(filters=None):
+    """Yield lists of expenses in id order, EXPENSES_CHUNK_SIZE rows at a time
+
+    A connection is only held while a chunk is fetched, never while the
+    client reads it. The first chunk is not retried, so the request fails
+    fast with a 500; later chunks retry brief outages from the last id.
+    """
+    query, params = get_expenses_query(filters)
+    after_id = 0
+    
+    while True:
+        for attempt in range(EXPENSES_CHUNK_RETRIES + 1):
+            try:
+                chunk = get_expenses_chunk(query, params, after_id)
+                break
+            except Exception as e:
+                # A pool timeout has already waited DB_POOL_TIMEOUT seconds
+                if (not after_id or attempt == EXPENSES_CHUNK_RETRIES
+                        or is_data_error(e) or isinstance(e.__cause__, PoolTimeout)):
+                    raise
+                time.sleep(backoff_delay(attempt, EXPENSES_RETRY_MAX_DELAY))
+        
+        if chunk:
+            yield chunk
+        if len(chunk) < EXPENSES_CHUNK_SIZE:
+            return
+        after_id = chunk[-1]['id']
+
+def get_monthly_summaries_from_db(year):
+    with db_conn() as connection:
+        try:
+            with connection.cursor() as cursor:
+                # Per-category sums plus a per-type total (category NULL)
+                # for every month, in a single round-trip
+                cursor.execute('''
+                    SELECT 
+                        EXTRACT(MONTH FROM date)::int as month,
+                        type,
+                        category,
+                        ROUND(SUM(amount), 2)::float as total
+                    FROM expenses 
+                    WHERE EXTRACT(YEAR FROM date) = %s
+                    GROUP BY GROUPING SETS (
+                        (EXTRACT(MONTH FROM date), type, category),
+                        (EXTRACT(MONTH FROM date), type)
+                    )
+                    ORDER BY month, type, category
+                ''', (year,))
+                
+                return cursor.fetchall()
+        except Exception as e:
+            raise Exception(f"Error getting summaries: {str(e)}") from e
 
 def delete_expense_from_db(expense_id):
-    connection = get_db_connection()
-    if connection is None:
-        raise Exception("No database connection")
+    with db_conn() as connection:
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute('DELETE FROM expenses WHERE id = %s', (expense_id,))
+                connection.commit()
+                
+                deleted = cursor.rowcount > 0
+                if deleted:
+                    invalidate_summary_cache()
+                return deleted
+        except Exception as e:
+            connection.rollback()
+            raise Exception(f"Error deleting record: {str(e)}") from e
+
+_write_queue = queue.Queue(maxsize=WRITE_QUEUE_SIZE)
+_WRITER_STOP = object()
+
+def expense_writer():
+    """Drain the write queue into the database until _WRITER_STOP is seen"""
+    stopping = False
+    while not stopping:
+        batch = []
+        item = _write_queue.get()
+        deadline = time.monotonic() + WRITE_FLUSH_INTERVAL
+        
+        while True:
+            if item is _WRITER_STOP:
+                stopping = True
+                break
+            batch.append(item)
+            remaining = deadline - time.monotonic()
+            if len(batch) >= WRITE_BATCH_SIZE or remaining <= 0:
+                break
+            try:
+                item = _write_queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+        
+        if batch:
+            flush_expense_batch(batch)
+
+def is_data_error(e):
+    """True when the database rejected the rows themselves, so retrying cannot help"""
+    return isinstance(e.__cause__, (psycopg.DataError, psycopg.IntegrityError))
+
+def flush_expense_batch(batch):
+    """Write queued expenses, retrying outages; only rows the database rejects are lost"""
+    attempt = 0
+    while True:
+        try:
+            save_expenses_bulk(batch)
+            return
+        except Exception as e:
+            if is_data_error(e):
+                error = e
+                break
+            delay = backoff_delay(attempt, WRITE_RETRY_MAX_DELAY)
+            attempt += 1
+            print(f'⏳ Could not write {len(batch)} queued expenses ({e}), retrying in {delay:.1f} seconds...')
+            time.sleep(delay)
     
-    try:
-        with connection.cursor() as cursor:
-            cursor.execute('DELETE FROM expenses WHERE id = %s', (expense_id,))
-            connection.commit()
-            return cursor.rowcount > 0
-    except Exception as e:
-        connection.rollback()
-        raise Exception(f"Error deleting record: {str(e)}")
-    finally:
-        connection.close()
+    # One rejected row rolls back the whole batch, so write the rows one at a
+    # time to keep the valid ones
+    if len(batch) > 1:
+        for item in batch:
+            flush_expense_batch([item])
+    else:
+        print(f'⚠️ Dropped queued expense {batch[0].model_dump(mode="json")}: {error}')
+
+def stop_expense_writer():
+    # Items queued before the sentinel are flushed before the thread exits
+    _write_queue.put(_WRITER_STOP)
+    _writer_thread.join(timeout=30)
+
+_writer_thread = threading.Thread(target=expense_writer, name='expense-writer', daemon=True)
+_writer_thread.start()
+atexit.register(stop_expense_writer)
+
+def json_default(obj):
+    if isinstance(obj, Decimal):
+        return float(obj)
+    raise TypeError(f'Object of type {type(obj).__name__} is not JSON serializable')
+
+def dump_json(obj):
+    """Serialize to UTF-8 JSON bytes; orjson writes dates as ISO strings natively"""
+    return orjson.dumps(obj, default=json_default)
 
-class DecimalEncoder(json.JSONEncoder):
-    def default(self, obj):
-        if isinstance(obj, Decimal):
-            return float(obj)
-        return super(DecimalEncoder, self).default(obj)
+class ExpenseJSONProvider(JSONProvider):
+    """Flask JSON provider backed by orjson"""
+    def dumps(self, obj, **kwargs):
+        return dump_json(obj).decode()
 
-app.json_encoder = DecimalEncoder
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(dump_json(obj), mimetype='application/json')
+
+app.json = ExpenseJSONProvider(app)
 
 @app.route('/')
 def home():
@@ -317,11 +453,14 @@ def home():
 
 @app.route('/api/status', methods=['GET'])
 def status_check():
-    connection = get_db_connection()
-    db_connected = connection is not None
-    
-    if connection:
-        connection.close()
+    # A pooled connection may have gone stale, so check it with a round-trip
+    try:
+        with db_conn(timeout=DB_STATUS_TIMEOUT) as connection:
+            with connection.cursor() as cursor:
+                cursor.execute('SELECT 1')
+        db_connected = True
+    except Exception:
+        db_connected = False
     
     return jsonify({
         'status': 'working',
@@ -339,74 +478,97 @@ def add_expense():
         if not data:
             return jsonify({'error': 'JSON data required'}), 400
         
-        if 'amount' in data:
-            data['amount'] = Decimal(str(data['amount']))
-        
         expense_data = ExpenseCreate(**data)
         
         expense = save_expense(expense_data)
         
         return jsonify({
             'message': 'Expense/Income added successfully',
-            'expense': expense.dict()
+            'expense': expense
         }), 201
         
     except ValidationError as e:
-        return jsonify({'error': 'Validation error', 'details': e.errors()}), 400
+        return jsonify({'error': 'Validation error', 'details': e.errors(include_url=False, include_context=False)}), 400
     except Exception as e:
         return jsonify({'error': f'Error saving expense: {str(e)}'}), 500
 
-@app.route('/api/expenses/list', methods=['GET'])
+@app.route('/api/expenses/async', methods=['POST'])
 @require_api_key
-def get_expenses():
+def add_expense_async():
     try:
-        connection = get_db_connection()
-        if connection is None:
-            return jsonify({'error': 'No database connection'}), 500
+        data = request.get_json()
         
-        with connection.cursor(cursor_factory=RealDictCursor) as cursor:
-            query = 'SELECT * FROM expenses WHERE 1=1'
-            params = []
-            
-            start_date = request.args.get('start_date')
-            end_date = request.args.get('end_date')
-            category = request.args.get('category')
-            expense_type = request.args.get('type')
-            
-            if start_date:
-                query += ' AND date >= %s'
-                params.append(start_date)
-            if end_date:
-                query += ' AND date <= %s'
-                params.append(end_date)
-            if category:
-                query += ' AND category = %s'
-                params.append(category)
-            if expense_type:
-                query += ' AND type = %s'
-                params.append(expense_type)
-            
-            query += ' ORDER BY id ASC'
-            
-            cursor.execute(query, params)
-            expenses = cursor.fetchall()
-            
-            for expense in expenses:
-                expense['amount'] = Decimal(str(expense['amount']))
-                expense['date'] = expense['date'].isoformat()
-                expense['id'] = int(expense['id'])
+        if not data:
+            return jsonify({'error': 'JSON data required'}), 400
         
-        connection.close()
+        expense_data = ExpenseCreate(**data)
+        
+        _write_queue.put_nowait(expense_data)
         
         return jsonify({
-            'count': len(expenses),
-            'expenses': expenses
-        }), 200
+            'message': 'Expense/Income accepted for processing'
+        }), 202
+        
+    except ValidationError as e:
+        return jsonify({'error': 'Validation error', 'details': e.errors(include_url=False, include_context=False)}), 400
+    except queue.Full:
+        return jsonify({'error': 'Too many pending expenses, try again later'}), 503
+    except Exception as e:
+        return jsonify({'error': f'Error queuing expense: {str(e)}'}), 500
+
+@app.route('/api/expenses/bulk', methods=['POST'])
+@require_api_key
+def add_expenses_bulk():
+    try:
+        data = request.get_json()
+        
+        if not data or not isinstance(data, list):
+            return jsonify({'error': 'JSON array of expenses required'}), 400
+        
+        expenses_data = EXPENSE_LIST_ADAPTER.validate_python(data)
+        
+        ids = save_expenses_bulk(expenses_data)
         
+        return jsonify({
+            'message': 'Expenses/Incomes added successfully',
+            'count': len(ids),
+            'ids': ids
+        }), 201
+        
+    except ValidationError as e:
+        return jsonify({'error': 'Validation error', 'details': e.errors(include_url=False, include_context=False)}), 400
+    except Exception as e:
+        return jsonify({'error': f'Error saving expenses: {str(e)}'}), 500
+
+@app.route('/api/expenses/list', methods=['GET'])
+@require_api_key
+def get_expenses():
+    try:
+        chunks = iter_expense_chunks(request.args)
+        # Fetch the first chunk here so database errors still get a 500 response
+        first = next(chunks, [])
     except Exception as e:
-        if 'connection' in locals():
-            connection.close()
         return jsonify({'error': f'Error reading expenses: {str(e)}'}), 500
+    
+    def generate():
+        count = 0
+        yield b'{"expenses":['
+        try:
+            chunk = first
+            while chunk:
+                for expense in chunk:
+                    yield (b',' if count else b'') + dump_json(expense)
+                    count += 1
+                chunk = next(chunks, [])
+        except Exception as e:
+            # Headers are already sent; close the document with an explicit
+            # error so a partial list is never mistaken for a complete one
+            print(f'⚠️ Expense list aborted after {count} rows: {e}')
+            yield b'],"count":%d,"error":%s}' % (count, dump_json(f'Error reading expenses: {str(e)}'))
+            return
+        yield b'],"count":%d}' % count
+    
+    return Response(generate(), status=200, mimetype='application/json')
 
 @app.route('/api/summary/months', methods=['GET'])
 @require_api_key
@@ -419,58 +581,54 @@ def get_monthly_summaries():
         except ValueError:
             return jsonify({'error': 'Year must be a valid number'}), 400
         
-        income_results, expense_results = get_monthly_summaries_from_db(year)
+        with _SUMMARY_CACHE_LOCK:
+            summaries = _SUMMARY_CACHE.get(year)
+            generation = _summary_cache_generation
         
-        month_names = {
-            1: 'January', 2: 'February', 3: 'March', 4: 'April',
-            5: 'May', 6: 'June', 7: 'July', 8: 'August',
-            9: 'September', 10: 'October', 11: 'November', 12: 'December'
-        }
+        if summaries is not None:
+            return jsonify({'monthly_summaries': summaries}), 200
         
+        results = get_monthly_summaries_from_db(year)
+        
+        # Keyed by month number; rows arrive ordered by month, so months are
+        # inserted in calendar order and only named when serializing
         monthly_data = {}
         
-        for month_num, category, total in income_results:
-            month_name = month_names[int(month_num)]
-            if month_name not in monthly_data:
-                monthly_data[month_name] = {
+        for month_num, expense_type, category, total in results:
+            if month_num not in monthly_data:
+                monthly_data[month_num] = {
                     'income': {},
                     'expenses_by_category': {},
-                    'total_expenses': Decimal('0.0'),
-                    'total_income': Decimal('0.0'),
-                    'balance': Decimal('0.0')
+                    'total_expenses': 0.0,
+                    'total_income': 0.0,
+                    'balance': 0.0
                 }
-            amount = Decimal(str(total))
-            monthly_data[month_name]['income'][category] = amount
-            monthly_data[month_name]['total_income'] += amount
-        
-        for month_num, category, total in expense_results:
-            month_name = month_names[int(month_num)]
-            if month_name not in monthly_data:
-                monthly_data[month_name] = {
-                    'income': {},
-                    'expenses_by_category': {},
-                    'total_expenses': Decimal('0.0'),
-                    'total_income': Decimal('0.0'),
-                    'balance': Decimal('0.0')
-                }
-            amount = Decimal(str(total))
-            monthly_data[month_name]['expenses_by_category'][category] = amount
-            monthly_data[month_name]['total_expenses'] += amount
-        
-        for month_name, data in monthly_data.items():
-            data['income'] = {k: round(v, 2) for k, v in data['income'].items()}
-            data['expenses_by_category'] = {k: round(v, 2) for k, v in data['expenses_by_category'].items()}
-            data['total_expenses'] = round(data['total_expenses'], 2)
-            data['total_income'] = round(data['total_income'], 2)
+            data = monthly_data[month_num]
+            
+            if category is None:
+                if expense_type == 'income':
+                    data['total_income'] = total
+                else:
+                    data['total_expenses'] = total
+            elif expense_type == 'income':
+                data['income'][category] = total
+            else:
+                data['expenses_by_category'][category] = total
+        
+        for data in monthly_data.values():
             data['balance'] = round(data['total_income'] - data['total_expenses'], 2)
         
-        sorted_summaries = dict(sorted(
-            monthly_data.items(),
-            key=lambda x: list(month_names.keys())[list(month_names.values()).index(x[0])]
-        ))
+        summaries = {
+            MONTH_NAMES[month_num]: data for month_num, data in monthly_data.items()
+        }
+        
+        # Skip caching if a write happened while this summary was computed
+        with _SUMMARY_CACHE_LOCK:
+            if generation == _summary_cache_generation:
+                _SUMMARY_CACHE[year] = summaries
         
         return jsonify({
-            'monthly_summaries': sorted_summaries
+            'monthly_summaries': summaries
         }), 200
         
     except Exception as e:
@@ -486,8 +644,4 @@ def delete_expense(expense_id):
         
         return jsonify({'message': 'Expense deleted successfully'}), 200
     except Exception as e:
-        return jsonify({'error': f'Error deleting expense: {str(e)}'}), 500
-
-if __name__ == '__main__':
-    debug_mode = os.getenv("FLASK_DEBUG", "0") == "1"
-    app.run(host='0.0.0.0', port=5000, debug=debug_mode)
\ No newline at end of file
+        return jsonify({'error': f'Error deleting expense: {str(e)}'}), 500
\ No newline at end of file